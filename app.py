@@ -1,14 +1,91 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, render_template
 from flask_cors import CORS
 import json
+import functools
+import orjson
 from ner import MedicalNER
 import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+# Micro-batching settings for /api/analyze. By default a batch is whatever is
+# already queued; a positive timeout makes the worker wait for stragglers.
+BATCH_SIZE = int(os.environ.get('BATCH_SIZE', 32))
+BATCH_TIMEOUT_MS = float(os.environ.get('BATCH_TIMEOUT_MS', 0))
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize the NER system
-ner_system = MedicalNER()
+class BatchingProcessor:
+    """Collect concurrent analyze requests and run them through the NER system in batches."""
+    
+    def __init__(self, ner, max_batch=BATCH_SIZE, timeout_ms=BATCH_TIMEOUT_MS):
+        self.ner = ner
+        self.max_batch = max_batch
+        self.timeout = timeout_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+    
+    def submit(self, text):
+        """Queue text for the next batch and wait for its entities."""
+        self._ensure_worker()
+        future = Future()
+        self._queue.put((text, future))
+        return future.result()
+    
+    def _ensure_worker(self):
+        """Start the worker thread on first use (and again in forked processes)."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+    
+    def _run(self):
+        """Drain up to max_batch queued texts, waiting at most timeout for stragglers."""
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.timeout
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                results = self.ner.extract_entities_batch([text for text, _ in batch])
+            except Exception:
+                # Retry one at a time so a bad input only fails its own request
+                for text, future in batch:
+                    try:
+                        future.set_result(self.ner.extract_entities(text))
+                    except Exception as e:
+                        future.set_exception(e)
+            else:
+                for (_, future), entities in zip(batch, results):
+                    future.set_result(entities)
+
+def json_response(payload, status=200):
+    """Serialize a payload with orjson (dataclasses included) into a JSON response."""
+    return app.response_class(orjson.dumps(payload), status=status, mimetype='application/json')
+
+@functools.cache
+def get_ner():
+    """Return the shared NER system, building it on first use."""
+    return MedicalNER()
+
+@functools.cache
+def get_batcher():
+    """Return the shared request batcher, building it on first use."""
+    return BatchingProcessor(get_ner())
 
 @app.route('/')
 def index():
@@ -19,56 +96,55 @@ def index():
 def analyze_text():
     """Analyze text and return extracted medical entities."""
     try:
-        data = request.get_json()
+        # Parse the body once with orjson rather than Flask's stdlib decoder
+        try:
+            data = orjson.loads(request.get_data())
+        except orjson.JSONDecodeError:
+            return json_response({
+                'error': 'Invalid JSON',
+                'message': 'Request body must be valid JSON'
+            }, 400)
         
-        if not data or 'text' not in data:
-            return jsonify({
+        text = data.get('text') if isinstance(data, dict) else None
+        
+        if not isinstance(text, str):
+            return json_response({
                 'error': 'No text provided',
                 'message': 'Please provide text to analyze'
-            }), 400
-        
-        text = data['text'].strip()
+            }, 400)
         
-        if not text:
-            return jsonify({
+        if not text or text.isspace():
+            return json_response({
                 'error': 'Empty text',
                 'message': 'Please provide non-empty text to analyze'
-            }), 400
+            }, 400)
         
-        # Extract entities
-        entities = ner_system.extract_entities(text)
+        # str.strip returns the same object when there is nothing to strip
+        text = text.strip()
         
-        # Convert entities to dictionary format
-        entities_data = []
-        for entity in entities:
-            entities_data.append({
-                'text': entity.text,
-                'label': entity.label,
-                'start': entity.start,
-                'end': entity.end,
-                'confidence': entity.confidence
-            })
+        # Extract entities (batched with any concurrent requests)
+        entities = get_batcher().submit(text)
         
         # Get annotated text
-        annotated_text = ner_system.annotate_text(text)
+        annotated_text = get_ner().annotate_text(text, entities)
         
         # Get entity summary
-        summary = ner_system.get_entity_summary(text)
+        summary = get_ner().get_entity_summary(text, entities)
         
-        return jsonify({
+        return json_response({
             'success': True,
             'original_text': text,
-            'entities': entities_data,
+            'entities': entities,
             'annotated_text': annotated_text,
             'summary': summary,
-            'total_entities': len(entities_data)
+            'total_entities': len(entities)
         })
     
     except Exception as e:
-        return jsonify({
+        return json_response({
             'error': 'Processing error',
             'message': str(e)
-        }), 500
+        }, 500)
 
 @app.route('/api/entity_types', methods=['GET'])
 def get_entity_types():
@@ -83,7 +159,7 @@ def get_entity_types():
         'DOSAGE': 'Medication dosages and frequencies'
     }
     
-    return jsonify({
+    return json_response({
         'success': True,
         'entity_types': entity_descriptions
     })
@@ -91,12 +167,17 @@ def get_entity_types():
 @app.route('/api/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({
+    return json_response({
         'status': 'healthy',
         'message': 'Medical NER API is running'
     })
 
 if __name__ == '__main__':
-    print("Starting Medical NER Flask API...")
-    print("Navigate to http://localhost:5000 to use the application")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    if os.environ.get('DEV'):
+        print("Starting Medical NER Flask API (development server)...")
+        print("Navigate to http://localhost:5000 to use the application")
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        print("Serve the API with gunicorn (settings in gunicorn.conf.py):")
+        print("    gunicorn app:app")
+        print("Set DEV=1 to use the Flask development server instead.")
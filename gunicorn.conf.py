@@ -0,0 +1,15 @@
+import multiprocessing
+import os
+
+# Import app.py once in the master process so forked workers share it
+preload_app = True
+
+bind = os.environ.get('BIND', '0.0.0.0:5000')
+workers = int(os.environ.get('WEB_CONCURRENCY', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('THREADS', 4))
+
+def when_ready(server):
+    """Build the NER matchers in the master so workers share them copy-on-write."""
+    from app import get_ner
+    get_ner()
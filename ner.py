@@ -1,10 +1,33 @@
 import re
 import json
-from typing import List, Dict, Tuple, Set
+import functools
+import threading
+import weakref
+from types import MappingProxyType
+from typing import List, Dict, Tuple, Set, FrozenSet, Optional
 from dataclasses import dataclass
 from collections import defaultdict
 
-@dataclass
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+# Extraction cache limits; longer texts are never cached, which bounds memory
+_CACHE_SIZE = 1024
+_CACHE_MAX_TEXT_LENGTH = 10_000
+
+@dataclass(slots=True, frozen=True)
 class Entity:
     """Represents a named entity with its properties."""
     text: str
@@ -13,257 +36,513 @@ class Entity:
     end: int
     confidence: float = 1.0
 
-class MedicalNER:
-    """Medical Named Entity Recognition system."""
+def _is_word_char(char: str) -> bool:
+    """Return True if the character is a regex word character (as used by \\b)."""
+    return char.isalnum() or char == '_'
+
+def _at_word_boundaries(text: str, start: int, end: int) -> bool:
+    """Return True if text[start:end] is delimited the way r'\\b...\\b' requires."""
+    if start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
+
+def _is_literal(word: str) -> bool:
+    """Return True for single-word terms that str.find can match without a regex."""
+    return word.isalnum()
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter
+# but whose str.lower() is not that letter (found by scanning every code point)
+_ASCII_CASE_FOLDS = str.maketrans({
+    '\u0130': 'i',  # LATIN CAPITAL LETTER I WITH DOT ABOVE
+    '\u0131': 'i',  # LATIN SMALL LETTER DOTLESS I
+    '\u017f': 's',  # LATIN SMALL LETTER LONG S
+    '\u212a': 'k',  # KELVIN SIGN
+})
+
+def _fold_case(text: str) -> str:
+    """Lowercase text without changing its length so match offsets stay valid."""
+    if not text.isascii():
+        text = text.translate(_ASCII_CASE_FOLDS)
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    # Any other characters that expand when lowercased never match the ASCII
+    # vocabulary, so they are left as-is
+    return ''.join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+# Disease vocabulary.
+_DISEASES: FrozenSet[str] = frozenset({
+    'diabetes', 'hypertension', 'cancer', 'asthma', 'pneumonia',
+    'bronchitis', 'arthritis', 'influenza', 'tuberculosis', 'malaria',
+    'covid-19', 'coronavirus', 'migraine', 'depression', 'anxiety',
+    'schizophrenia', 'alzheimer', 'parkinson', 'stroke', 'heart attack',
+    'myocardial infarction', 'angina', 'epilepsy', 'seizure', 'lupus',
+    'hepatitis', 'cirrhosis', 'kidney disease', 'renal failure',
+    'liver disease', 'gallstones', 'appendicitis', 'gastritis',
+    'ulcer', 'ibs', 'irritable bowel syndrome', 'crohn disease',
+    'celiac disease', 'anemia', 'leukemia', 'lymphoma', 'melanoma',
+    'osteoporosis', 'fibromyalgia', 'gout', 'thyroid disease',
+    'hyperthyroidism', 'hypothyroidism', 'diabetes type 1',
+    'diabetes type 2', 'gestational diabetes', 'copd',
+    'chronic obstructive pulmonary disease', 'emphysema'
+})
+
+# Medication vocabulary.
+_MEDICATIONS: FrozenSet[str] = frozenset({
+    'aspirin', 'ibuprofen', 'acetaminophen', 'paracetamol', 'morphine',
+    'codeine', 'tramadol', 'oxycodone', 'fentanyl', 'metformin',
+    'insulin', 'lisinopril', 'amlodipine', 'atorvastatin', 'simvastatin',
+    'omeprazole', 'pantoprazole', 'albuterol', 'prednisone', 'warfarin',
+    'heparin', 'digoxin', 'furosemide', 'hydrochlorothiazide',
+    'levothyroxine', 'synthroid', 'gabapentin', 'pregabalin',
+    'sertraline', 'fluoxetine', 'citalopram', 'escitalopram',
+    'venlafaxine', 'duloxetine', 'risperidone', 'quetiapine',
+    'olanzapine', 'haloperidol', 'lorazepam', 'diazepam',
+    'alprazolam', 'clonazepam', 'zolpidem', 'eszopiclone',
+    'amoxicillin', 'azithromycin', 'ciprofloxacin', 'doxycycline',
+    'penicillin', 'vancomycin', 'cephalexin', 'metronidazole'
+})
+
+# Symptom vocabulary.
+_SYMPTOMS: FrozenSet[str] = frozenset({
+    'fever', 'headache', 'nausea', 'vomiting', 'diarrhea', 'constipation',
+    'cough', 'sore throat', 'runny nose', 'congestion', 'fatigue',
+    'weakness', 'dizziness', 'shortness of breath', 'chest pain',
+    'abdominal pain', 'back pain', 'joint pain', 'muscle pain',
+    'rash', 'itching', 'swelling', 'inflammation', 'bleeding',
+    'bruising', 'numbness', 'tingling', 'vision problems',
+    'hearing loss', 'tinnitus', 'difficulty swallowing',
+    'loss of appetite', 'weight loss', 'weight gain', 'insomnia',
+    'excessive sleepiness', 'confusion', 'memory loss', 'seizures',
+    'tremors', 'stiffness', 'palpitations', 'irregular heartbeat',
+    'high blood pressure', 'low blood pressure', 'difficulty breathing',
+    'wheezing', 'snoring', 'night sweats', 'hot flashes',
+    'cold intolerance', 'heat intolerance', 'excessive thirst',
+    'frequent urination', 'painful urination', 'blood in urine',
+    'constipation', 'loose stools', 'heartburn', 'acid reflux'
+})
+
+# Body parts vocabulary.
+_BODY_PARTS: FrozenSet[str] = frozenset({
+    'head', 'brain', 'skull', 'face', 'eye', 'eyes', 'ear', 'ears',
+    'nose', 'mouth', 'teeth', 'tongue', 'throat', 'neck', 'shoulder',
+    'shoulders', 'arm', 'arms', 'elbow', 'elbows', 'wrist', 'wrists',
+    'hand', 'hands', 'finger', 'fingers', 'thumb', 'chest', 'breast',
+    'breasts', 'lung', 'lungs', 'heart', 'back', 'spine', 'abdomen',
+    'stomach', 'liver', 'kidney', 'kidneys', 'bladder', 'intestines',
+    'colon', 'rectum', 'hip', 'hips', 'leg', 'legs', 'thigh', 'thighs',
+    'knee', 'knees', 'ankle', 'ankles', 'foot', 'feet', 'toe', 'toes',
+    'skin', 'muscle', 'muscles', 'bone', 'bones', 'joint', 'joints',
+    'blood', 'vein', 'veins', 'artery', 'arteries', 'nerve', 'nerves',
+    'thyroid', 'pancreas', 'gallbladder', 'appendix', 'spleen',
+    'lymph nodes', 'prostate', 'uterus', 'ovaries', 'testicles'
+})
+
+# Medical procedures vocabulary.
+_PROCEDURES: FrozenSet[str] = frozenset({
+    'surgery', 'operation', 'biopsy', 'endoscopy', 'colonoscopy',
+    'mammography', 'ultrasound', 'x-ray', 'ct scan', 'mri',
+    'pet scan', 'ecg', 'ekg', 'echocardiogram', 'stress test',
+    'blood test', 'urine test', 'physical examination', 'checkup',
+    'vaccination', 'immunization', 'injection', 'transfusion',
+    'dialysis', 'chemotherapy', 'radiation therapy', 'physical therapy',
+    'occupational therapy', 'speech therapy', 'psychotherapy',
+    'counseling', 'anesthesia', 'intubation', 'catheterization',
+    'suturing', 'wound care', 'bandaging', 'cast application',
+    'splinting', 'joint replacement', 'bypass surgery',
+    'angioplasty', 'stent placement', 'pacemaker implantation'
+})
+
+# Medical tests vocabulary.
+_TESTS: FrozenSet[str] = frozenset({
+    'complete blood count', 'cbc', 'basic metabolic panel', 'bmp',
+    'comprehensive metabolic panel', 'cmp', 'lipid panel',
+    'liver function tests', 'kidney function tests', 'thyroid function tests',
+    'glucose test', 'hemoglobin a1c', 'psa test', 'cholesterol test',
+    'triglycerides test', 'blood pressure measurement', 'pulse oximetry',
+    'spirometry', 'pulmonary function tests', 'electrocardiogram',
+    'holter monitor', 'event monitor', 'treadmill test',
+    'nuclear stress test', 'cardiac catheterization', 'angiogram',
+    'bone density scan', 'dexa scan', 'skin test', 'allergy test',
+    'culture test', 'sensitivity test', 'pathology report',
+    'genetic testing', 'tumor markers', 'inflammatory markers'
+})
+
+# Dosage pattern fragments, matched together as one alternation.
+_DOSAGE_FRAGMENTS: Tuple[str, ...] = (
+    r'\d+\s*mg',
+    r'\d+\s*mcg',
+    r'\d+\s*g',
+    r'\d+\s*ml',
+    r'\d+\s*units?',
+    r'\d+\s*tablets?',
+    r'\d+\s*capsules?',
+    r'\d+\s*times?\s+(?:a\s+)?day',
+    r'(?:once|twice|thrice)\s+(?:a\s+)?day',
+    r'every\s+\d+\s+hours?',
+    r'\d+\s*drops?'
+)
+
+# Standalone dosage regexes, as exposed through MedicalNER.entity_types.
+_DOSAGE_PATTERNS: Tuple[str, ...] = tuple(r'\b' + fragment + r'\b'
+                                          for fragment in _DOSAGE_FRAGMENTS)
+
+# RE2, Hyperscan and stdlib bytes patterns each leave some of the ASCII
+# characters stdlib str \s matches (\x0b, \x1c-\x1f) out of their \s, so the
+# matched pattern spells the whitespace class out for every engine to agree
+_WHITESPACE = r'[\s\x0b\x1c-\x1f]'
+_DOSAGE_PATTERN = (r'\b(?:'
+                   + '|'.join(fragment.replace(r'\s', _WHITESPACE)
+                              for fragment in _DOSAGE_FRAGMENTS)
+                   + r')\b')
+
+_ENTITY_TYPES = {
+    'DISEASE': _DISEASES,
+    'MEDICATION': _MEDICATIONS,
+    'SYMPTOM': _SYMPTOMS,
+    'BODY_PART': _BODY_PARTS,
+    'PROCEDURE': _PROCEDURES,
+    'TEST': _TESTS,
+    'DOSAGE': _DOSAGE_PATTERNS
+}
+
+# Vocabulary term -> entity type, for matchers that report only the term
+_TERM_LABELS: Dict[str, str] = {
+    word: entity_type
+    for entity_type, words in _ENTITY_TYPES.items()
+    if entity_type != 'DOSAGE'
+    for word in words
+}
+
+@functools.cache
+def _build_automaton():
+    """Build one Aho-Corasick automaton holding every vocabulary term."""
+    if ahocorasick is None:
+        return None
     
-    def __init__(self):
-        """Initialize the Medical NER system with predefined medical vocabularies."""
-        self.entity_types = {
-            'DISEASE': self._load_diseases(),
-            'MEDICATION': self._load_medications(),
-            'SYMPTOM': self._load_symptoms(),
-            'BODY_PART': self._load_body_parts(),
-            'PROCEDURE': self._load_procedures(),
-            'TEST': self._load_tests(),
-            'DOSAGE': self._load_dosage_patterns()
-        }
-        
-        # Compile regex patterns for better performance
-        self.compiled_patterns = self._compile_patterns()
-        
-    def _load_diseases(self) -> Set[str]:
-        """Load disease vocabulary."""
-        diseases = {
-            'diabetes', 'hypertension', 'cancer', 'asthma', 'pneumonia',
-            'bronchitis', 'arthritis', 'influenza', 'tuberculosis', 'malaria',
-            'covid-19', 'coronavirus', 'migraine', 'depression', 'anxiety',
-            'schizophrenia', 'alzheimer', 'parkinson', 'stroke', 'heart attack',
-            'myocardial infarction', 'angina', 'epilepsy', 'seizure', 'lupus',
-            'hepatitis', 'cirrhosis', 'kidney disease', 'renal failure',
-            'liver disease', 'gallstones', 'appendicitis', 'gastritis',
-            'ulcer', 'ibs', 'irritable bowel syndrome', 'crohn disease',
-            'celiac disease', 'anemia', 'leukemia', 'lymphoma', 'melanoma',
-            'osteoporosis', 'fibromyalgia', 'gout', 'thyroid disease',
-            'hyperthyroidism', 'hypothyroidism', 'diabetes type 1',
-            'diabetes type 2', 'gestational diabetes', 'copd',
-            'chronic obstructive pulmonary disease', 'emphysema'
-        }
-        return diseases
+    # Payload carries the label and term length, so a single pass over the text
+    # yields labelled spans for every entity type
+    automaton = ahocorasick.Automaton()
+    for word, entity_type in _TERM_LABELS.items():
+        automaton.add_word(word, (entity_type, len(word)))
+    automaton.make_automaton()
+    return automaton
+
+@functools.cache
+def _build_hyperscan_database():
+    """Compile every vocabulary term and dosage pattern into one Hyperscan database."""
+    if hyperscan is None:
+        return None
     
-    def _load_medications(self) -> Set[str]:
-        """Load medication vocabulary."""
-        medications = {
-            'aspirin', 'ibuprofen', 'acetaminophen', 'paracetamol', 'morphine',
-            'codeine', 'tramadol', 'oxycodone', 'fentanyl', 'metformin',
-            'insulin', 'lisinopril', 'amlodipine', 'atorvastatin', 'simvastatin',
-            'omeprazole', 'pantoprazole', 'albuterol', 'prednisone', 'warfarin',
-            'heparin', 'digoxin', 'furosemide', 'hydrochlorothiazide',
-            'levothyroxine', 'synthroid', 'gabapentin', 'pregabalin',
-            'sertraline', 'fluoxetine', 'citalopram', 'escitalopram',
-            'venlafaxine', 'duloxetine', 'risperidone', 'quetiapine',
-            'olanzapine', 'haloperidol', 'lorazepam', 'diazepam',
-            'alprazolam', 'clonazepam', 'zolpidem', 'eszopiclone',
-            'amoxicillin', 'azithromycin', 'ciprofloxacin', 'doxycycline',
-            'penicillin', 'vancomycin', 'cephalexin', 'metronidazole'
-        }
-        return medications
+    # Expression id -> (entity_type, term length); dosages vary in length, so
+    # Hyperscan is asked to report their start offsets instead
+    expressions, flags, labels = [], [], []
+    for word, entity_type in _TERM_LABELS.items():
+        expressions.append((r'\b' + re.escape(word) + r'\b').encode())
+        flags.append(0)
+        labels.append((entity_type, len(word)))
+    expressions.append(_DOSAGE_PATTERN.encode())
+    flags.append(hyperscan.HS_FLAG_SOM_LEFTMOST)
+    labels.append(('DOSAGE', None))
     
-    def _load_symptoms(self) -> Set[str]:
-        """Load symptom vocabulary."""
-        symptoms = {
-            'fever', 'headache', 'nausea', 'vomiting', 'diarrhea', 'constipation',
-            'cough', 'sore throat', 'runny nose', 'congestion', 'fatigue',
-            'weakness', 'dizziness', 'shortness of breath', 'chest pain',
-            'abdominal pain', 'back pain', 'joint pain', 'muscle pain',
-            'rash', 'itching', 'swelling', 'inflammation', 'bleeding',
-            'bruising', 'numbness', 'tingling', 'vision problems',
-            'hearing loss', 'tinnitus', 'difficulty swallowing',
-            'loss of appetite', 'weight loss', 'weight gain', 'insomnia',
-            'excessive sleepiness', 'confusion', 'memory loss', 'seizures',
-            'tremors', 'stiffness', 'palpitations', 'irregular heartbeat',
-            'high blood pressure', 'low blood pressure', 'difficulty breathing',
-            'wheezing', 'snoring', 'night sweats', 'hot flashes',
-            'cold intolerance', 'heat intolerance', 'excessive thirst',
-            'frequent urination', 'painful urination', 'blood in urine',
-            'constipation', 'loose stools', 'heartburn', 'acid reflux'
-        }
-        return symptoms
+    database = hyperscan.Database()
+    database.compile(expressions=expressions, ids=list(range(len(expressions))),
+                     elements=len(expressions), flags=flags)
+    return database, tuple(labels)
+
+def _collect_match(match_id: int, start: int, end: int, flags: int, matches: list) -> None:
+    """Hyperscan match callback that records each match in the context list."""
+    matches.append((match_id, start, end))
+
+@dataclass(frozen=True)
+class _CompiledPatterns:
+    """Vocabulary and dosage matchers compiled for one regex engine."""
+    literal_terms: Dict[str, Tuple[Tuple[str, str], ...]]
+    phrase_pattern: Optional[object]
+    phrase_first_chars: FrozenSet[str]
+    dosage_pattern: object
+
+@functools.cache
+def _compile_patterns(engine, as_bytes: bool) -> _CompiledPatterns:
+    """Compile regex patterns for efficient matching with the given engine.
     
-    def _load_body_parts(self) -> Set[str]:
-        """Load body parts vocabulary."""
-        body_parts = {
-            'head', 'brain', 'skull', 'face', 'eye', 'eyes', 'ear', 'ears',
-            'nose', 'mouth', 'teeth', 'tongue', 'throat', 'neck', 'shoulder',
-            'shoulders', 'arm', 'arms', 'elbow', 'elbows', 'wrist', 'wrists',
-            'hand', 'hands', 'finger', 'fingers', 'thumb', 'chest', 'breast',
-            'breasts', 'lung', 'lungs', 'heart', 'back', 'spine', 'abdomen',
-            'stomach', 'liver', 'kidney', 'kidneys', 'bladder', 'intestines',
-            'colon', 'rectum', 'hip', 'hips', 'leg', 'legs', 'thigh', 'thighs',
-            'knee', 'knees', 'ankle', 'ankles', 'foot', 'feet', 'toe', 'toes',
-            'skin', 'muscle', 'muscles', 'bone', 'bones', 'joint', 'joints',
-            'blood', 'vein', 'veins', 'artery', 'arteries', 'nerve', 'nerves',
-            'thyroid', 'pancreas', 'gallbladder', 'appendix', 'spleen',
-            'lymph nodes', 'prostate', 'uterus', 'ovaries', 'testicles'
-        }
-        return body_parts
+    With as_bytes the patterns are compiled for ASCII text encoded to bytes,
+    which skips the engines' Unicode handling.
+    """
+    def build(pattern: str):
+        return engine.compile(pattern.encode('ascii') if as_bytes else pattern)
     
-    def _load_procedures(self) -> Set[str]:
-        """Load medical procedures vocabulary."""
-        procedures = {
-            'surgery', 'operation', 'biopsy', 'endoscopy', 'colonoscopy',
-            'mammography', 'ultrasound', 'x-ray', 'ct scan', 'mri',
-            'pet scan', 'ecg', 'ekg', 'echocardiogram', 'stress test',
-            'blood test', 'urine test', 'physical examination', 'checkup',
-            'vaccination', 'immunization', 'injection', 'transfusion',
-            'dialysis', 'chemotherapy', 'radiation therapy', 'physical therapy',
-            'occupational therapy', 'speech therapy', 'psychotherapy',
-            'counseling', 'anesthesia', 'intubation', 'catheterization',
-            'suturing', 'wound care', 'bandaging', 'cast application',
-            'splinting', 'joint replacement', 'bypass surgery',
-            'angioplasty', 'stent placement', 'pacemaker implantation'
-        }
-        return procedures
+    literal_terms = {}
+    phrase_pattern = None
+    phrase_first_chars = frozenset()
     
-    def _load_tests(self) -> Set[str]:
-        """Load medical tests vocabulary."""
-        tests = {
-            'complete blood count', 'cbc', 'basic metabolic panel', 'bmp',
-            'comprehensive metabolic panel', 'cmp', 'lipid panel',
-            'liver function tests', 'kidney function tests', 'thyroid function tests',
-            'glucose test', 'hemoglobin a1c', 'psa test', 'cholesterol test',
-            'triglycerides test', 'blood pressure measurement', 'pulse oximetry',
-            'spirometry', 'pulmonary function tests', 'electrocardiogram',
-            'holter monitor', 'event monitor', 'treadmill test',
-            'nuclear stress test', 'cardiac catheterization', 'angiogram',
-            'bone density scan', 'dexa scan', 'skin test', 'allergy test',
-            'culture test', 'sensitivity test', 'pathology report',
-            'genetic testing', 'tumor markers', 'inflammatory markers'
-        }
-        return tests
+    # The automaton covers every vocabulary term when available
+    if ahocorasick is None:
+        # RE2 matches a large alternation in one linear pass, but with stdlib re
+        # single-word terms are cheaper to find with str.find
+        # (grouped by first character, so terms that can't occur are skipped)
+        if engine is re:
+            grouped = defaultdict(list)
+            for word, entity_type in sorted(_TERM_LABELS.items()):
+                if _is_literal(word):
+                    grouped[word[0]].append((word, entity_type))
+            literal_terms = {char: tuple(terms) for char, terms in grouped.items()}
+        literals = {word for terms in literal_terms.values() for word, _ in terms}
+        
+        # Longest phrases first so 'diabetes type 2' wins over 'diabetes'. Text is
+        # lowercased before matching, so the pattern can stay case-sensitive.
+        phrases = sorted((word for word in _TERM_LABELS if word not in literals),
+                         key=len, reverse=True)
+        pattern = r'\b(?:' + '|'.join(map(re.escape, phrases)) + r')\b'
+        phrase_pattern = build(pattern)
+        phrase_first_chars = frozenset(word[0] for word in phrases)
     
-    def _load_dosage_patterns(self) -> List[str]:
-        """Load dosage pattern regexes."""
-        patterns = [
-            r'\b\d+\s*mg\b',
-            r'\b\d+\s*mcg\b',
-            r'\b\d+\s*g\b',
-            r'\b\d+\s*ml\b',
-            r'\b\d+\s*units?\b',
-            r'\b\d+\s*tablets?\b',
-            r'\b\d+\s*capsules?\b',
-            r'\b\d+\s*times?\s+(?:a\s+)?day\b',
-            r'\b(?:once|twice|thrice)\s+(?:a\s+)?day\b',
-            r'\bevery\s+\d+\s+hours?\b',
-            r'\b\d+\s*drops?\b'
-        ]
-        return patterns
+    # Compile the dosage alternation
+    dosage_pattern = build(_DOSAGE_PATTERN)
     
-    def _compile_patterns(self) -> Dict[str, List]:
-        """Compile regex patterns for efficient matching."""
-        compiled = {}
-        
-        # Compile word-based patterns for exact matches
-        for entity_type, words in self.entity_types.items():
-            if entity_type != 'DOSAGE':
-                # Create regex patterns for each word/phrase
-                patterns = []
-                for word in words:
-                    # Handle multi-word phrases
-                    escaped_word = re.escape(word)
-                    pattern = r'\b' + escaped_word + r'\b'
-                    patterns.append(re.compile(pattern, re.IGNORECASE))
-                compiled[entity_type] = patterns
-        
-        # Compile dosage patterns
-        compiled['DOSAGE'] = [re.compile(pattern, re.IGNORECASE) 
-                             for pattern in self.entity_types['DOSAGE']]
-        
-        return compiled
+    return _CompiledPatterns(literal_terms, phrase_pattern, phrase_first_chars, dosage_pattern)
+
+class MedicalNER:
+    """Medical Named Entity Recognition system."""
     
+    def __init__(self):
+        """Initialize the Medical NER system with predefined medical vocabularies."""
+        # Vocabularies and compiled matchers are module-level and built once per
+        # process, so extra instances (and forked workers) share them. The
+        # matchers are built from these, so they are exposed read-only.
+        self.entity_types = MappingProxyType(_ENTITY_TYPES)
+        
+        # Single Aho-Corasick automaton over all vocabularies when available
+        self.automaton = _build_automaton()
+        
+        # Hyperscan database covering every pattern at once when available; it
+        # matches ASCII text only, other text uses the matchers below
+        self.hyperscan = _build_hyperscan_database()
+        self._hyperscan_scratch = threading.local()
+        
+        # Compile regex patterns for better performance. ASCII text is matched
+        # as bytes, with RE2's linear-time engine when available; RE2's \b only
+        # knows ASCII word characters, so other text uses stdlib str patterns.
+        self.compiled_patterns = _compile_patterns(re2 or re, True)
+        self.unicode_patterns = _compile_patterns(re, False)
+        
+        # Memoize extraction so the same text is only scanned once. The cache
+        # holds a weak reference to the method to avoid a self -> cache -> self cycle.
+        extract = weakref.WeakMethod(self._extract)
+        self._extract_cached = functools.lru_cache(maxsize=_CACHE_SIZE)(
+            lambda text: extract()(text))
+        
     def extract_entities(self, text: str) -> List[Entity]:
         """Extract all medical entities from the given text."""
+        if len(text) > _CACHE_MAX_TEXT_LENGTH:
+            return list(self._extract(text))
+        return list(self._extract_cached(text))
+    
+    def extract_entities_batch(self, texts: List[str]) -> List[List[Entity]]:
+        """Extract medical entities from several texts in one call."""
+        return [self.extract_entities(text) for text in texts]
+    
+    def _extract(self, text: str) -> Tuple[Entity, ...]:
+        """Run every matcher over the text and resolve overlapping entities."""
         entities = []
         
-        # Extract entities for each type
-        for entity_type, patterns in self.compiled_patterns.items():
-            entities.extend(self._extract_by_type(text, entity_type, patterns))
+        # Lowercase once and match case-sensitively; offsets line up with text
+        lowered = _fold_case(text)
+        
+        # ASCII text is matched as bytes; byte and character offsets coincide
+        is_ascii = lowered.isascii()
+        if is_ascii:
+            compiled_patterns = self.compiled_patterns
+            subject = lowered.encode('ascii')
+        else:
+            compiled_patterns = self.unicode_patterns
+            subject = lowered
+        
+        if self.hyperscan is not None and is_ascii:
+            # One Hyperscan pass finds every entity type
+            entities.extend(self._extract_hyperscan(text, subject))
+        else:
+            # Scan the text once for all vocabulary terms
+            if self.automaton is not None:
+                entities.extend(self._extract_vocabulary(text, lowered))
+            else:
+                # Characters present in the text let whole groups of terms be skipped
+                present = set(lowered)
+                entities.extend(self._extract_literals(text, lowered, present,
+                                                       compiled_patterns.literal_terms))
+                if not present.isdisjoint(compiled_patterns.phrase_first_chars):
+                    entities.extend(self._extract_phrases(text, lowered, subject,
+                                                          compiled_patterns.phrase_pattern))
+            
+            # Extract dosages
+            entities.extend(self._extract_by_type(text, subject, 'DOSAGE',
+                                                  compiled_patterns.dosage_pattern))
         
-        # Remove duplicates and overlapping entities
+        # Remove duplicates and overlapping entities; the result is already in
+        # start order, which annotate_text and get_entity_summary rely on
         entities = self._remove_overlaps(entities)
         
-        # Sort by start position
-        entities.sort(key=lambda x: x.start)
+        return tuple(entities)
+    
+    def _extract_hyperscan(self, text: str, subject: bytes) -> List[Entity]:
+        """Extract entities of every type in a single Hyperscan pass over ASCII bytes."""
+        database, labels = self.hyperscan
+        
+        # Scratch space can't be shared between concurrent scans
+        scratch = getattr(self._hyperscan_scratch, 'scratch', None)
+        if scratch is None:
+            scratch = self._hyperscan_scratch.scratch = hyperscan.Scratch(database)
+        
+        matches = []
+        database.scan(subject, match_event_handler=_collect_match,
+                      context=matches, scratch=scratch)
+        
+        entities = []
+        for match_id, start, end in matches:
+            entity_type, length = labels[match_id]
+            if length is not None:
+                start = end - length
+            entities.append(Entity(
+                text=text[start:end],
+                label=entity_type,
+                start=start,
+                end=end,
+                confidence=1.0
+            ))
         
         return entities
     
-    def _extract_by_type(self, text: str, entity_type: str, patterns: List) -> List[Entity]:
-        """Extract entities of a specific type."""
+    def _extract_vocabulary(self, text: str, lowered: str) -> List[Entity]:
+        """Extract vocabulary entities of every type in a single automaton pass."""
         entities = []
         
-        for pattern in patterns:
-            for match in pattern.finditer(text):
-                entity = Entity(
-                    text=match.group(),
-                    label=entity_type,
-                    start=match.start(),
-                    end=match.end(),
-                    confidence=1.0
-                )
-                entities.append(entity)
+        for end_idx, (entity_type, length) in self.automaton.iter(lowered):
+            start = end_idx - length + 1
+            end = end_idx + 1
+            
+            # Enforce the same word boundaries as r'\bword\b'
+            if not _at_word_boundaries(lowered, start, end):
+                continue
+            
+            entities.append(Entity(
+                text=text[start:end],
+                label=entity_type,
+                start=start,
+                end=end,
+                confidence=1.0
+            ))
+        
+        return entities
+    
+    def _extract_literals(self, text: str, lowered: str, present: Set[str],
+                          literal_terms: Dict[str, Tuple[Tuple[str, str], ...]]) -> List[Entity]:
+        """Extract single-word vocabulary entities using plain substring search."""
+        entities = []
+        
+        for first_char, terms in literal_terms.items():
+            if first_char not in present:
+                continue
+            for word, entity_type in terms:
+                start = lowered.find(word)
+                while start != -1:
+                    end = start + len(word)
+                    if _at_word_boundaries(lowered, start, end):
+                        entities.append(Entity(
+                            text=text[start:end],
+                            label=entity_type,
+                            start=start,
+                            end=end,
+                            confidence=1.0
+                        ))
+                    start = lowered.find(word, start + 1)
+        
+        return entities
+    
+    def _extract_phrases(self, text: str, lowered: str, subject, pattern) -> List[Entity]:
+        """Extract the remaining vocabulary entities of every type with one regex."""
+        entities = []
+        
+        for match in pattern.finditer(subject):
+            start, end = match.span()
+            entities.append(Entity(
+                text=text[start:end],
+                label=_TERM_LABELS[lowered[start:end]],
+                start=start,
+                end=end,
+                confidence=1.0
+            ))
+        
+        return entities
+    
+    def _extract_by_type(self, text: str, subject, entity_type: str, pattern) -> List[Entity]:
+        """Extract entities of a specific type matched by a compiled pattern."""
+        entities = []
+        
+        for match in pattern.finditer(subject):
+            start, end = match.span()
+            entity = Entity(
+                text=text[start:end],
+                label=entity_type,
+                start=start,
+                end=end,
+                confidence=1.0
+            )
+            entities.append(entity)
         
         return entities
     
     def _remove_overlaps(self, entities: List[Entity]) -> List[Entity]:
-        """Remove overlapping entities, keeping the longest ones."""
+        """Remove overlapping entities, keeping the longest ones, in start order."""
         if not entities:
             return entities
         
         # Sort by start position, then by length (descending)
         entities.sort(key=lambda x: (x.start, -(x.end - x.start)))
         
+        # Accepted entities never overlap and arrive in start order, so an entity
+        # overlaps one of them exactly when it starts before the last accepted end
         filtered = []
+        current_end = -1
         for entity in entities:
-            # Check if this entity overlaps with any already accepted entity
-            overlaps = False
-            for accepted in filtered:
-                if (entity.start < accepted.end and entity.end > accepted.start):
-                    overlaps = True
-                    break
-            
-            if not overlaps:
+            if entity.start >= current_end:
                 filtered.append(entity)
+                current_end = entity.end
         
         return filtered
     
-    def annotate_text(self, text: str) -> str:
-        """Annotate text with entity labels."""
-        entities = self.extract_entities(text)
+    def annotate_text(self, text: str, entities: Optional[List[Entity]] = None) -> str:
+        """Annotate text with entity labels, reusing already extracted entities if given."""
+        if entities is None:
+            entities = self.extract_entities(text)
         
         if not entities:
             return text
         
-        # Sort entities by start position in reverse order
-        entities.sort(key=lambda x: x.start, reverse=True)
-        
-        annotated_text = text
+        # Entities come from extract_entities in start order, so build the
+        # annotated text in one forward pass
+        chunks = []
+        cursor = 0
         for entity in entities:
-            annotation = f"[{entity.text}|{entity.label}]"
-            annotated_text = (annotated_text[:entity.start] + 
-                            annotation + 
-                            annotated_text[entity.end:])
+            chunks.append(text[cursor:entity.start])
+            chunks.append(f"[{entity.text}|{entity.label}]")
+            cursor = entity.end
+        chunks.append(text[cursor:])
         
-        return annotated_text
+        return ''.join(chunks)
     
-    def get_entity_summary(self, text: str) -> Dict[str, List[str]]:
-        """Get a summary of entities grouped by type."""
-        entities = self.extract_entities(text)
+    def get_entity_summary(self, text: str, entities: Optional[List[Entity]] = None) -> Dict[str, List[str]]:
+        """Get a summary of entities grouped by type, reusing already extracted entities if given."""
+        if entities is None:
+            entities = self.extract_entities(text)
         
-        summary = defaultdict(list)
+        # Insertion-ordered dicts dedupe each label's texts in O(1) per entity
+        summary = defaultdict(dict)
         for entity in entities:
-            if entity.text not in summary[entity.label]:
-                summary[entity.label].append(entity.text)
+            summary[entity.label][entity.text] = None
         
-        return dict(summary)
+        return {label: list(texts) for label, texts in summary.items()}
 
 def main():
     """Main function to run the Medical NER system interactively."""
@@ -311,10 +590,10 @@ def main():
                     print(f"{i:2d}. {entity.text:<20} [{entity.label}]")
                 
                 print(f"\nAnnotated text:")
-                print(ner.annotate_text(user_input))
+                print(ner.annotate_text(user_input, entities))
                 
                 print(f"\nEntity Summary:")
-                summary = ner.get_entity_summary(user_input)
+                summary = ner.get_entity_summary(user_input, entities)
                 for entity_type, entities_list in summary.items():
                     print(f"  {entity_type}: {', '.join(entities_list)}")
                     
@@ -0,0 +1,71 @@
+import re
+import unittest
+
+import ner
+from ner import MedicalNER, _build_hyperscan_database, _collect_match, _compile_patterns
+
+# Every ASCII character as a separator, so engines that disagree on what \s
+# covers (\x0b, \x1c-\x1f) show up as differing matches
+SEPARATORS = tuple(map(chr, range(128)))
+TEMPLATES = (
+    'take 5{0}mg daily',
+    'every{0}8{0}hours',
+    'twice{0}a day',
+    '3{0}times{0}a{0}day',
+)
+
+
+def _texts():
+    for separator in SEPARATORS:
+        for template in TEMPLATES:
+            yield template.format(separator)
+
+
+def _str_dosage_spans(text):
+    """Dosage spans found by the stdlib str patterns, the reference behaviour."""
+    pattern = _compile_patterns(re, False).dosage_pattern
+    return [match.span() for match in pattern.finditer(text.lower())]
+
+
+class DosageWhitespaceTest(unittest.TestCase):
+    def test_bytes_patterns_match_str_patterns(self):
+        pattern = _compile_patterns(re, True).dosage_pattern
+        for text in _texts():
+            with self.subTest(text=text):
+                subject = text.lower().encode('ascii')
+                spans = [match.span() for match in pattern.finditer(subject)]
+                self.assertEqual(spans, _str_dosage_spans(text))
+
+    def test_extract_entities_matches_str_patterns(self):
+        extractor = MedicalNER()
+        for text in _texts():
+            with self.subTest(text=text):
+                spans = [(entity.start, entity.end)
+                         for entity in extractor.extract_entities(text)
+                         if entity.label == 'DOSAGE']
+                self.assertEqual(spans, _str_dosage_spans(text))
+
+    @unittest.skipIf(ner.re2 is None, 'google-re2 is not installed')
+    def test_re2_patterns_match_str_patterns(self):
+        pattern = _compile_patterns(ner.re2, True).dosage_pattern
+        for text in _texts():
+            with self.subTest(text=text):
+                subject = text.lower().encode('ascii')
+                spans = [match.span() for match in pattern.finditer(subject)]
+                self.assertEqual(spans, _str_dosage_spans(text))
+
+    @unittest.skipIf(ner.hyperscan is None, 'hyperscan is not installed')
+    def test_hyperscan_database_matches_str_patterns(self):
+        database, labels = _build_hyperscan_database()
+        for text in _texts():
+            with self.subTest(text=text):
+                matches = []
+                database.scan(text.lower().encode('ascii'),
+                              match_event_handler=_collect_match, context=matches)
+                spans = [(start, end) for match_id, start, end in matches
+                         if labels[match_id][0] == 'DOSAGE']
+                self.assertEqual(spans, _str_dosage_spans(text))
+
+
+if __name__ == '__main__':
+    unittest.main()